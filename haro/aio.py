@@ -0,0 +1,136 @@
+import asyncio
+
+import httpx
+
+from haro import api
+from haro.api import RankResult, NumericPredictionResult, AnticipateResult, CustomResult
+
+_MAX_KEEPALIVE_CONNECTIONS = 32
+
+
+class AsyncHaroAPIClient(object):
+    def __init__(self, api_id, api_key, http2=True, transport=None):
+        """
+        Asyncio Haro API Client.
+        Makes calls to Haro prediction REST API concurrently over a single pool of connections.
+
+        Args:
+            api_id (str): Application API id
+            api_key (str): Application API key
+            http2 (bool): when True, multiplex concurrent requests over one HTTP/2 connection.
+                Requires the h2 package (pip install httpx[http2])
+            transport (httpx.AsyncBaseTransport or None): Optional custom httpx transport
+        Notes:
+            Requires the httpx package.
+            Close the client with `await client.aclose()`, or use it as an async context manager.
+        """
+        self.api_id = api_id
+        self.api_key = api_key
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(http2=http2, retries=api._MAX_RETRIES)
+        self._client = httpx.AsyncClient(
+            http2=http2, transport=transport,
+            headers=api._build_request_headers(api_id, api_key),
+            limits=httpx.Limits(max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS),
+            timeout=httpx.Timeout(api._READ_TIMEOUT, connect=api._CONNECT_TIMEOUT))
+        self._prediction_url = api._build_base_url(api._PREDICTION_API_ENDPOINT, api._PREDICTION_API_VERSION)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def rank(self, pid, user, subset=None, top=None, include_scores=False, name=None):
+        """
+        Return a ranking prediction for a given user.
+        See HaroAPIClient.rank
+        """
+        params = {}
+        if subset is not None:
+            params['subset'] = api._dumps(subset).decode('utf-8')
+        if top is not None:
+            params['top'] = top
+        if include_scores is not None:
+            params['include_scores'] = str(include_scores)
+        if name is not None:
+            params['name'] = name
+        r = await self._get("rank", pid, user, params, "Unable to make a rank prediction")
+        entities, scores = api._load_rank(r.content)
+        return RankResult(entities=entities, scores=scores, pid=pid, name=name,
+                          meta=_get_meta_from_response_headers(r))
+
+    async def predict(self, pid, user, name=None):
+        """
+        Return a numeric prediction for a given user.
+        See HaroAPIClient.predict
+        """
+        r = await self._get("predict", pid, user, _name_params(name), "Unable to make a numerical prediction")
+        return NumericPredictionResult._from_predictions(api._loads(r.content), pid, name,
+                                                         _get_meta_from_response_headers(r))
+
+    async def anticipate(self, pid, user, name=None):
+        """
+        Return an anticipate prediction for a given user.
+        See HaroAPIClient.anticipate
+        """
+        r = await self._get("anticipate", pid, user, _name_params(name), "Unable to make an anticipate prediction")
+        return AnticipateResult._from_predictions(api._loads(r.content), pid, name,
+                                                  _get_meta_from_response_headers(r))
+
+    async def custom(self, pid, user, name=None):
+        """
+        Returns a custom prediction for a given user [advanced usage]
+        See HaroAPIClient.custom
+        """
+        r = await self._get("custom", pid, user, _name_params(name), "Unable to make a custom prediction")
+        return CustomResult._from_predictions(api._loads(r.content), pid, name,
+                                              _get_meta_from_response_headers(r))
+
+    async def batch_predict(self, requests_list):
+        """
+        Makes several predictions concurrently.
+
+        Args:
+            requests_list (list of dict): keyword arguments of each prediction, e.g.
+                {"pid": "rank-items-for-action-watch", "user": "u1", "top": 5}.
+                The prediction type (rank, predict, anticipate or custom) is taken from the pid.
+        Returns:
+            list of PredictionResult: prediction results, in the same order as requests_list
+        Raises:
+            IOError: in case of http issues
+            ValueError: in case of an unknown predictor type
+        """
+        # resolve every pid first, so an unknown one raises before any coroutine is created
+        calls = [getattr(self, api.HaroAPIClient._get_predictor_type_from_pid(r['pid'])) for r in requests_list]
+        return await asyncio.gather(*(call(**r) for (call, r) in zip(calls, requests_list)))
+
+    async def _get(self, pred_type, pid, user, params, error_message):
+        url = "".join((self._prediction_url, pred_type, "/", api._quote_path_segment(pid),
+                       "/user/", api._quote_path_segment(user), "/"))
+        try:
+            r = await self._client.get(url, params=params)
+            r.raise_for_status()
+        except httpx.HTTPError as e:
+            raise IOError("{}. Error was: {}".format(error_message, e))
+        return r
+
+
+def _name_params(name):
+    return {} if name is None else {'name': name}
+
+
+def _get_meta_from_response_headers(response):
+    """
+    Returns:
+        dict: meta data extracted from the response headers
+    Notes:
+        The header names keep the case they were received in, as with HaroAPIClient.
+        HTTP/2 sends header names in lower case, so the meta keys are then lower case too.
+    """
+    headers = response.headers
+    return {k[2:].decode(headers.encoding): v.decode(headers.encoding)
+            for (k, v) in headers.raw if k[:2] in (b"X-", b"x-")}
@@ -1,15 +1,45 @@
+import functools
+import gzip
 import json
+import math
 import re
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import quote
 
-import posixpath
-
-import datetime
 import requests
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
 from urllib3.exceptions import RequestError
-from six import string_types
-
-ALPHA_NUMERIC_REGEX = r"^[\.a-zA-Z0-9_-]{1,128}$"
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional msgpack wire format
+    msgspec = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional, gzip is used instead
+    zstandard = None
+
+ALPHA_NUMERIC_REGEX = r"^[.a-zA-Z0-9_-]{1,128}\Z"
+_ALPHA_NUMERIC_RE = re.compile(ALPHA_NUMERIC_REGEX)
+_ALPHA_NUMERIC_CHARS = (string.ascii_letters + string.digits + "._-").encode('ascii')
+_ALPHA_NUMERIC_MAX_LENGTH = 128
+_CONTEXT_VALUE_TYPES = (int, float, str)
+# exact types of the usual context values, a set lookup is cheaper than the isinstance tuple check
+_CONTEXT_VALUE_EXACT_TYPES = frozenset((int, float, str, bool))
+# valid event timestamps, in milliseconds since unix epoch: 1970-01-01 to 9999-12-31
+_TS_MIN_MS = 0
+_TS_MAX_MS = 253402300799999
 
 _EVENTS_API_ENDPOINT = "https://events.haro.io"
 _EVENTS_API_VERSION = "v16.10"
@@ -17,6 +47,164 @@ _PREDICTION_API_ENDPOINT = "https://api.haro.io"
 _PREDICTION_API_VERSION = "v17.12"
 
 _MAX_RETRIES = 3
+_RETRY_BACKOFF_FACTOR = 0.2
+_RETRY_STATUS_CODES = (500, 502, 503, 504)
+_RETRY_METHODS = frozenset(['GET', 'POST'])
+_POOL_CONNECTIONS = 8
+_POOL_MAXSIZE = 32
+_BULK_MAX_WORKERS = 16
+_COMPRESSION_THRESHOLD = 4096
+_COMPRESSION_LEVEL = 3
+_QUOTE_CACHE_SIZE = 4096
+_CONNECT_TIMEOUT = 3.0
+_READ_TIMEOUT = 10.0
+
+
+# built once: json.dumps only reuses its cached encoder when called without options
+_json_encode = json.JSONEncoder(separators=(',', ':'), allow_nan=False).encode
+
+if orjson is not None:
+    def _dumps(obj):
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            # orjson rejects integers over 64 bits and non-str dict keys, which json encodes.
+            # Unvalidated events may hold either, and are left for the server to ignore.
+            return _json_encode(obj).encode('utf-8')
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return _json_encode(obj).encode('utf-8')
+
+    def _loads(content):
+        return json.loads(content.decode('utf-8'))
+
+
+def _dump_events_json(events):
+    return _dumps([e.as_dict() for e in events])
+
+
+if msgspec is not None:
+    _EventStruct = msgspec.defstruct("EventStruct", [("id", str), ("action", str), ("item", str),
+                                                     ("ts", int), ("user", str), ("context", dict)])
+    _msgpack_encoder = msgspec.msgpack.Encoder()
+
+    def _dump_events_msgpack(events):
+        structs = [_EventStruct(e.id, e.action, e.item, e.timestamp, e.user, e.context) for e in events]
+        try:
+            return _msgpack_encoder.encode(structs)
+        except OverflowError:
+            # msgpack integers are limited to 64 bits, so unlike json such events can't be sent
+            # for the server to ignore. Find the event to report.
+            for (e, struct) in zip(events, structs):
+                try:
+                    _msgpack_encoder.encode(struct)
+                except OverflowError as error:
+                    raise ValueError("Event {} can not be encoded as msgpack: {}".format(e.id, error))
+            raise
+
+    _RankPayload = msgspec.defstruct("RankPayload", [("entities", list), ("scores", Optional[list], None)])
+    _rank_decoder = msgspec.json.Decoder(_RankPayload)
+
+    def _load_rank(content):
+        """
+        Returns:
+            (list, list or None): entities and scores of a rank response, decoded in one pass
+        """
+        payload = _rank_decoder.decode(content)
+        return payload.entities, payload.scores
+else:
+    def _load_rank(content):
+        response = _loads(content)
+        return response['entities'], response.get('scores', None)
+
+# wire format -> (content type, events serializer)
+_WIRE_FORMATS = {
+    "json": ("application/json", _dump_events_json),
+}
+if msgspec is not None:
+    _WIRE_FORMATS["msgpack"] = ("application/msgpack", _dump_events_msgpack)
+
+
+if zstandard is not None:
+    def _compress(body):
+        """
+        Returns:
+            (str, bytes): content encoding and compressed body
+        """
+        return "zstd", zstandard.compress(body, level=_COMPRESSION_LEVEL)
+else:
+    def _compress(body):
+        return "gzip", gzip.compress(body, compresslevel=_COMPRESSION_LEVEL)
+
+
+def _build_request_headers(api_id, api_key):
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "X-API-ID": api_id,
+        "X-API-KEY": api_key,
+    }
+    return headers
+
+
+def _build_base_url(endpoint, version):
+    """
+    Returns:
+        str: API base url, ending with a slash
+    """
+    return "{}/{}/".format(endpoint.rstrip("/"), version)
+
+
+@functools.lru_cache(maxsize=_QUOTE_CACHE_SIZE)
+def _quote_path_segment(segment):
+    """
+    Returns:
+        str: segment percent-quoted for use in a url path. Cached, since the same pids and users
+            are asked for over and over
+    """
+    return quote(segment, safe="")
+
+
+def _build_retry():
+    """
+    Returns:
+        Retry: retry policy for the API calls, applied by urllib3 on every pooled connection
+    """
+    kwargs = dict(total=_MAX_RETRIES, backoff_factor=_RETRY_BACKOFF_FACTOR,
+                  status_forcelist=_RETRY_STATUS_CODES, raise_on_status=False)
+    try:
+        return Retry(allowed_methods=_RETRY_METHODS, **kwargs)
+    except TypeError:
+        # urllib3 < 1.26
+        return Retry(method_whitelist=_RETRY_METHODS, **kwargs)
+
+
+def _all_alphanumeric(values):
+    """
+    Checks a list of strings against ALPHA_NUMERIC_REGEX in a single pass.
+    The values are joined with a separator that is not an allowed character and every allowed
+    byte is deleted with bytes.translate, so only the separators are left when all values are valid.
+
+    Returns:
+        bool: True if every value is a valid alphanumeric string
+    """
+    try:
+        joined = " ".join(values).encode('ascii')
+    except (TypeError, UnicodeError):
+        return False
+    lengths = [len(v) for v in values]
+    return (len(joined.translate(None, _ALPHA_NUMERIC_CHARS)) == len(values) - 1 and
+            min(lengths) > 0 and max(lengths) <= _ALPHA_NUMERIC_MAX_LENGTH)
+
+
+def now_ms():
+    """
+    Returns:
+        int: the current time in milliseconds since unix epoch, as expected by Event timestamps
+    """
+    return time.time_ns() // 1000000
 
 
 class Event(object):
@@ -25,6 +213,8 @@ class Event(object):
     For instance, user watched a video, user played a mission, or user booked an appointment.
     """
 
+    __slots__ = ('id', 'action', 'item', 'timestamp', 'user', 'context')
+
     # noinspection PyShadowingBuiltins
     def __init__(self, id, action, item, timestamp, user, context=None):
         """
@@ -41,14 +231,16 @@ class Event(object):
         self.item = item
         self.user = user
         self.context = context or {}
-        try:
-            self.timestamp = int(timestamp)
-        except (ValueError, TypeError, OverflowError):
-            raise ValueError("timestamp must be an int, got: {}".format(timestamp))
+        if type(timestamp) is not int:
+            try:
+                timestamp = int(timestamp)
+            except (ValueError, TypeError, OverflowError):
+                raise ValueError("timestamp must be an int, got: {}".format(timestamp))
+        self.timestamp = timestamp
 
     def as_dict(self):
-        return dict(id=self.id, action=self.action, item=self.item,
-                    ts=self.timestamp, user=self.user, context=self.context)
+        return {'id': self.id, 'action': self.action, 'item': self.item,
+                'ts': self.timestamp, 'user': self.user, 'context': self.context}
 
     def validate(self):
         """
@@ -56,31 +248,85 @@ class Event(object):
         Raises:
             ValueError: in case the event is not valid
         """
-        for required_alphanumeric in ('id', 'action', 'item', 'user'):
-            value = getattr(self, required_alphanumeric, None)
-            if value is None:
-                raise ValueError("{} is required".format(required_alphanumeric))
-            try:
-                match = re.match(ALPHA_NUMERIC_REGEX, value)
-            except TypeError:
-                match = False
-            if not match:
-                raise ValueError("{} is an invalid value for {}".format(value, required_alphanumeric))
-        try:
-            _ = datetime.datetime.fromtimestamp(self.timestamp / 1000.0)
-        except (OverflowError, ValueError):
+        # constant time checks first, so malformed events are rejected before scanning any strings
+        if not _TS_MIN_MS <= self.timestamp <= _TS_MAX_MS:
             raise ValueError("timestamp is not valid: {}".format(self.timestamp))
-        if not isinstance(self.context, dict):
-            raise ValueError("Event context must be a dictionary. Got: {}".format(self.context))
-        for (k, v) in self.context.items():
-            if not re.match(ALPHA_NUMERIC_REGEX, k):
-                raise ValueError("{} is an invalid context key".format(k))
-            if not isinstance(v, (int, float)) and not isinstance(v, string_types):
-                raise ValueError("context values must either be numeric or string. Got: ".format(v))
+        context = self.context
+        if context and not isinstance(context, dict):
+            raise ValueError("Event context must be a dictionary. Got: {}".format(context))
+        identifiers = [self.id, self.action, self.item, self.user]
+        if context:
+            identifiers.extend(context)
+        # Fast path: check all identifiers at once, and only fall back to the per-field checks
+        # to find out which one is invalid.
+        identifiers_valid = _all_alphanumeric(identifiers)
+        if not identifiers_valid:
+            for required_alphanumeric in ('id', 'action', 'item', 'user'):
+                value = getattr(self, required_alphanumeric, None)
+                if value is None:
+                    raise ValueError("{} is required".format(required_alphanumeric))
+                try:
+                    match = _ALPHA_NUMERIC_RE.match(value)
+                except TypeError:
+                    match = False
+                if not match:
+                    raise ValueError("{} is an invalid value for {}".format(value, required_alphanumeric))
+        if context:
+            # the context is empty in the common case, and is then trivially valid
+            for (k, v) in context.items():
+                if not identifiers_valid and not _ALPHA_NUMERIC_RE.match(k):
+                    raise ValueError("{} is an invalid context key".format(k))
+                if type(v) not in _CONTEXT_VALUE_EXACT_TYPES and not isinstance(v, _CONTEXT_VALUE_TYPES):
+                    raise ValueError("context values must either be numeric or string. Got: {}".format(v))
+                if isinstance(v, float) and not math.isfinite(v):
+                    # not valid json, orjson would silently send null instead
+                    raise ValueError("context values must be finite numbers. Got: {}".format(v))
+
+
+def _validate_events(events):
+    """
+    Checks that all events are valid Haro events, same as calling Event.validate() on each of them.
+    The identifiers and context keys of the whole batch are checked in a single scan, timestamps only
+    at the batch min and max, and contexts only when they are not empty.
+    Event.validate() is only called when the batch is invalid, to report the first invalid event.
+
+    Args:
+        events (list of Event): events to validate
+    Raises:
+        ValueError: in case an event is not valid
+    """
+    if events and not _events_valid(events):
+        for e in events:
+            e.validate()
+
+
+def _events_valid(events):
+    """
+    Returns:
+        bool: True if all the events are valid
+    """
+    identifiers = []
+    add_identifiers = identifiers.extend
+    for e in events:
+        add_identifiers((e.id, e.action, e.item, e.user))
+        context = e.context
+        if context:
+            if not isinstance(context, dict):
+                return False
+            add_identifiers(context)
+            for v in context.values():
+                if type(v) not in _CONTEXT_VALUE_EXACT_TYPES and not isinstance(v, _CONTEXT_VALUE_TYPES):
+                    return False
+                if isinstance(v, float) and not math.isfinite(v):
+                    return False
+    timestamps = [e.timestamp for e in events]
+    return (_all_alphanumeric(identifiers) and
+            _TS_MIN_MS <= min(timestamps) and max(timestamps) <= _TS_MAX_MS)
 
 
 class HaroAPIClient(object):
-    def __init__(self, api_id, api_key):
+    def __init__(self, api_id, api_key, wire_format="json", compress=False,
+                 timeout=(_CONNECT_TIMEOUT, _READ_TIMEOUT)):
         """
         Haro API Client.
         A thin wrapper for making calls to Haro events and prediction REST API
@@ -88,19 +334,63 @@ class HaroAPIClient(object):
         Args:
             api_id (str): Application API id
             api_key (str): Application API key
+            wire_format (str): encoding of the events sent to Haro, either "json" or "msgpack".
+                "msgpack" is smaller and faster to encode, requires the msgspec package and
+                an events API endpoint that accepts application/msgpack.
+            compress (bool): when True, compress event batches larger than 4 KiB, with zstd if the
+                zstandard package is installed and gzip otherwise. The events API endpoint must accept
+                the content encoding.
+            timeout (float or tuple): connect and read timeouts in seconds, as accepted by requests
+        Raises:
+            ValueError: in case of an unsupported wire format
         Notes:
             A client is initialized for a single app and can only send events to and ask for prediction for
             that application.
+            The client keeps a pool of connections alive between calls to both the events and
+            prediction API hosts, so reuse a single client instead of creating one per call.
+            Call close(), or use the client as a context manager, to release the connections.
         """
+        if wire_format == "msgpack" and msgspec is None:
+            raise ValueError("The msgpack wire format requires the msgspec package")
+        if wire_format not in _WIRE_FORMATS:
+            raise ValueError("Unsupported wire format: {}".format(wire_format))
         self.api_id = api_id
         self.api_key = api_key
+        self._wire_format = wire_format
+        self._compress = compress
+        self._timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update(_build_request_headers(api_id, api_key))
+        adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE,
+                              max_retries=_build_retry())
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # threads are only started once bulk predictions are requested
+        self._executor = ThreadPoolExecutor(max_workers=_BULK_MAX_WORKERS)
+        self._events_url = _build_base_url(_EVENTS_API_ENDPOINT, _EVENTS_API_VERSION) + "events"
+        self._prediction_url = _build_base_url(_PREDICTION_API_ENDPOINT, _PREDICTION_API_VERSION)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pooled connections and stops the bulk prediction threads
+        """
+        self._executor.shutdown()
+        self._session.close()
 
     def send_events(self, events, validate=True):
         """
         Args:
             events (list of Event): list of Event objects to send to Haro
             validate (bool): when True, do validation before sending the events
-                When false, the server will accept all valid events and ignore invalid events
+                When false, the server will accept all valid events and ignore invalid events.
+                With the msgpack wire format, events holding integers over 64 bits still raise ValueError,
+                as they can't be encoded.
         Returns:
            (int, list): number of events successfully delivered, and a list of errors
         Raises:
@@ -108,47 +398,30 @@ class HaroAPIClient(object):
             ValueError: in case of invalid events
         """
         if validate:
-            for e in events:
-                e.validate()
-        return self._send_events_with_retry(events, validate=validate, num_retries=_MAX_RETRIES)
-
-    def _send_events_with_retry(self, events, validate, num_retries):
-        """
-        Args:
-            events (list of Event):
-        Returns:
-            (int, list): number of events successfully delivered, and a list of errors
-        """
-
-        headers = self._build_request_headers()
-        url = posixpath.join(_EVENTS_API_ENDPOINT, _EVENTS_API_VERSION, "events")
+            _validate_events(events)
         params = {}
         if not validate:
             params['ignore_invalid'] = True
-        data = [e.as_dict() for e in events]
-        r = requests.post(url, headers=headers, json=data, params=params)
-        if r.status_code == 400 and r.content and r.json():
-            raise ValueError("Server event validation failed. Server message was: {}".format(r.json()))
+        content_type, dump_events = _WIRE_FORMATS[self._wire_format]
+        data = dump_events(events)
+        headers = {"Content-Type": content_type}
+        if self._compress and len(data) > _COMPRESSION_THRESHOLD:
+            headers["Content-Encoding"], data = _compress(data)
+        r = self._session.post(self._events_url, data=data, params=params, headers=headers,
+                               timeout=self._timeout)
+        if r.status_code == 400 and r.content:
+            message = _loads(r.content)
+            if message:
+                raise ValueError("Server event validation failed. Server message was: {}".format(message))
         try:
             r.raise_for_status()
         except (HTTPError, RequestError) as e:
-            if num_retries > 0:
-                return self._send_events_with_retry(events, validate=validate, num_retries=num_retries - 1)
             raise IOError("Unable to send events to Haro. Original error was: {}".format(e))
-        data = r.json()
+        data = _loads(r.content)
         errors = data.get('errors', [])
         num_sent = data.get('count', 0)
         return num_sent, errors
 
-    def _build_request_headers(self):
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "X-API-ID": self.api_id,
-            "X-API-KEY": self.api_key,
-        }
-        return headers
-
     def rank(self, pid, user, subset=None, top=None, include_scores=False, name=None):
         """
         Return a ranking prediction for a given user.
@@ -164,28 +437,24 @@ class HaroAPIClient(object):
                 , and if include_scores is True, list of relative scores
                    "
         """
-        url = posixpath.join(_PREDICTION_API_ENDPOINT, _PREDICTION_API_VERSION,
-                             "rank", pid, "user", user, "")
-        headers = self._build_request_headers()
-        params = {}
-        if subset is not None:
-            params['subset'] = json.dumps(subset)
-        if top is not None:
-            params['top'] = top
-        if include_scores is not None:
-            params['include_scores'] = include_scores
-        if name is not None:
-            params['name'] = name
-        r = requests.get(url, headers=headers, params=params)
-        try:
-            r.raise_for_status()
-        except (HTTPError, RequestError) as e:
-            raise IOError("Unable to make a rank prediction. Error was: {}".format(e))
-        response = r.json()
-        return RankResult(entities=response['entities'],
-                          scores=response.get('scores', None),
-                          pid=pid, name=name,
-                          meta=_get_meta_from_response_headers(r))
+        if subset is None and top is None and name is None:
+            # common case, skip building a params dict for requests to encode
+            params = None
+            query = "" if include_scores is None else "?include_scores={}".format(include_scores)
+        else:
+            query = ""
+            params = {}
+            if subset is not None:
+                params['subset'] = _dumps(subset).decode('utf-8')
+            if top is not None:
+                params['top'] = top
+            if include_scores is not None:
+                params['include_scores'] = include_scores
+            if name is not None:
+                params['name'] = name
+        r = self._get_prediction("rank", pid, user, "Unable to make a rank prediction", query, params)
+        entities, scores = _load_rank(r.content)
+        return RankResult(entities, scores, pid, name, _get_meta_from_response_headers(r))
 
     def predict(self, pid, user, name=None):
         """
@@ -199,20 +468,10 @@ class HaroAPIClient(object):
             NumericPredictionResult: containing the predicted value
                    "
         """
-        url = posixpath.join(_PREDICTION_API_ENDPOINT, _PREDICTION_API_VERSION,
-                             "predict", pid, "user", user, "")
-        headers = self._build_request_headers()
-        params = {}
-        if name is not None:
-            params['name'] = name
-        r = requests.get(url, headers=headers, params=params)
-        try:
-            r.raise_for_status()
-        except (HTTPError, RequestError) as e:
-            raise IOError("Unable to make a numerical prediction. Error was: {}".format(e))
-        response = r.json()
-        return NumericPredictionResult(value=response['value'], pid=pid, name=name,
-                                       meta=_get_meta_from_response_headers(r))
+        r = self._get_prediction("predict", pid, user, "Unable to make a numerical prediction",
+                                 _name_query(name))
+        return NumericPredictionResult._from_predictions(_loads(r.content), pid, name,
+                                                         _get_meta_from_response_headers(r))
 
     def anticipate(self, pid, user, name=None):
         """
@@ -227,20 +486,10 @@ class HaroAPIClient(object):
             the given user
                    "
         """
-        url = posixpath.join(_PREDICTION_API_ENDPOINT, _PREDICTION_API_VERSION,
-                             "anticipate", pid, "user", user, "")
-        headers = self._build_request_headers()
-        params = {}
-        if name is not None:
-            params['name'] = name
-        r = requests.get(url, headers=headers, params=params)
-        try:
-            r.raise_for_status()
-        except (HTTPError, RequestError) as e:
-            raise IOError("Unable to make an anticipate prediction. Error was: {}".format(e))
-        response = r.json()
-        return AnticipateResult(value=response['value'], pid=pid, name=name,
-                                meta=_get_meta_from_response_headers(r))
+        r = self._get_prediction("anticipate", pid, user, "Unable to make an anticipate prediction",
+                                 _name_query(name))
+        return AnticipateResult._from_predictions(_loads(r.content), pid, name,
+                                                  _get_meta_from_response_headers(r))
 
     def custom(self, pid, user, name=None):
         """
@@ -254,20 +503,33 @@ class HaroAPIClient(object):
             CustomResult: containing the custom value
                    "
         """
-        url = posixpath.join(_PREDICTION_API_ENDPOINT, _PREDICTION_API_VERSION,
-                             "custom", pid, "user", user, "")
-        headers = self._build_request_headers()
-        params = {}
-        if name is not None:
-            params['name'] = name
-        r = requests.get(url, headers=headers, params=params)
+        r = self._get_prediction("custom", pid, user, "Unable to make a custom prediction",
+                                 _name_query(name))
+        return CustomResult._from_predictions(_loads(r.content), pid, name,
+                                              _get_meta_from_response_headers(r))
+
+    def _get_prediction(self, pred_type, pid, user, error_message, query="", params=None):
+        """
+        Args:
+            pred_type (str): Predictor type, one of rank, predict, anticipate or custom
+            pid (str): Predictor identifier
+            user (str): User id
+            error_message (str): description of the failure for the raised IOError
+            query (str): query string to append to the url, including the leading "?"
+            params (dict or None): query parameters for requests to encode
+        Returns:
+            requests.Response: the successful prediction API response
+        Raises:
+            IOError: in case of http issues
+        """
+        url = "".join((self._prediction_url, pred_type, "/", _quote_path_segment(pid),
+                       "/user/", _quote_path_segment(user), "/", query))
+        r = self._session.get(url, params=params, timeout=self._timeout)
         try:
             r.raise_for_status()
         except (HTTPError, RequestError) as e:
-            raise IOError("Unable to make a custom prediction. Error was: {}".format(e))
-        response = r.json()
-        return CustomResult(value=response['value'], pid=pid, name=name,
-                            meta=_get_meta_from_response_headers(r))
+            raise IOError("{}. Error was: {}".format(error_message, e))
+        return r
 
     def all_predictions(self, user, top=None, include_scores=False):
         """
@@ -280,52 +542,63 @@ class HaroAPIClient(object):
         Returns:
             list of PredictionResult: list of prediction results from active predictors
         """
-        url = posixpath.join(_PREDICTION_API_ENDPOINT, _PREDICTION_API_VERSION,
-                             "all-predictions", "user", user, "")
-        headers = self._build_request_headers()
+        url = "".join((self._prediction_url, "all-predictions/user/", _quote_path_segment(user), "/"))
         params = {}
         if top is not None:
             params['top'] = top
         if include_scores is not None:
             params['include_scores'] = include_scores
-        r = requests.get(url, headers=headers, params=params)
+        r = self._session.get(url, params=params, timeout=self._timeout)
         try:
             r.raise_for_status()
         except (HTTPError, RequestError) as e:
             raise IOError("Unable to get all user predictions. Error was: {}".format(e))
-        response = r.json()
         prediction_results = []
-        for result in response:
+        for result in _loads(r.content):
             pid = result['pid']
-            pred_type = self._get_predictor_type_from_pid(pid)
-            if pred_type == "rank":
-                prediction_result = RankResult(
-                    entities=result['predictions']['entities'],
-                    scores=result['predictions'].get('scores', None),
-                    pid=pid, name=result['name'])
-            elif pred_type == 'predict':
-                prediction_result = NumericPredictionResult(
-                    value=result['predictions']['value'],
-                    pid=pid, name=result['name'])
-            elif pred_type == 'anticipate':
-                prediction_result = AnticipateResult(
-                    value=result['predictions']['value'],
-                    pid=pid, name=result['name'])
-            elif pred_type == 'custom':
-                prediction_result = CustomResult(
-                    value=result['predictions']['value'],
-                    pid=pid, name=result['name'])
-            else:
+            result_type = _RESULT_TYPES.get(pid.split('-', 1)[0])
+            if result_type is None:
                 continue
-            prediction_results.append(prediction_result)
+            prediction_results.append(result_type._from_predictions(result['predictions'], pid, result['name']))
         return prediction_results
 
+    def bulk_rank(self, requests_list):
+        """
+        Makes several rank predictions concurrently, over the client's pooled connections.
+
+        Args:
+            requests_list (iterable of dict): keyword arguments of each rank call, e.g.
+                {"pid": "rank-items-for-action-watch", "user": "u1", "top": 5}
+        Returns:
+            list of RankResult: prediction results, in the same order as requests_list
+        Raises:
+            IOError: in case of http issues
+        """
+        return self._bulk(self.rank, requests_list)
+
+    def bulk_predict(self, requests_list):
+        """
+        Makes several numeric predictions concurrently, over the client's pooled connections.
+
+        Args:
+            requests_list (iterable of dict): keyword arguments of each predict call, e.g.
+                {"pid": "predict-avg-context-for-action-watch-context-duration_seconds", "user": "u1"}
+        Returns:
+            list of NumericPredictionResult: prediction results, in the same order as requests_list
+        Raises:
+            IOError: in case of http issues
+        """
+        return self._bulk(self.predict, requests_list)
+
+    def _bulk(self, prediction_method, requests_list):
+        return list(self._executor.map(lambda kwargs: prediction_method(**kwargs), requests_list))
+
     @staticmethod
     def _get_predictor_type_from_pid(pid):
-        for predictor_type in ('rank', 'predict', 'anticipate', 'custom'):
-            if pid.startswith(predictor_type):
-                return predictor_type
-        raise ValueError("Unknown predictor type in pid: {}".format(pid))
+        predictor_type = pid.split('-', 1)[0]
+        if predictor_type not in _RESULT_TYPES:
+            raise ValueError("Unknown predictor type in pid: {}".format(pid))
+        return predictor_type
 
 
 class PredictionResult(object):
@@ -333,6 +606,8 @@ class PredictionResult(object):
     Represents a single  prediction for a user
     """
 
+    __slots__ = ('pid', 'name', 'meta')
+
     def __init__(self, pid, name, meta=None):
         """
         Args:
@@ -344,12 +619,27 @@ class PredictionResult(object):
         self.name = name
         self.meta = meta if meta is not None else {}
 
+    @classmethod
+    def _from_predictions(cls, predictions, pid, name, meta=None):
+        """
+        Args:
+            predictions (dict): prediction payload returned by the API, holding a single value
+            pid (str): Predictor identifier that generated this prediction
+            name (str): Predictor custom that generated this prediction
+            meta (dict or None): additional meta information about the prediction
+        Returns:
+            PredictionResult: the prediction result
+        """
+        return cls(predictions['value'], pid, name, meta)
+
 
 class RankResult(PredictionResult):
     """
     Represents a single ranking prediction for a user
     """
 
+    __slots__ = ('entities', 'scores')
+
     def __init__(self, entities, scores, pid, name, meta=None):
         """
         Args:
@@ -363,6 +653,10 @@ class RankResult(PredictionResult):
         self.entities = entities
         self.scores = scores
 
+    @classmethod
+    def _from_predictions(cls, predictions, pid, name, meta=None):
+        return cls(predictions['entities'], predictions.get('scores', None), pid, name, meta)
+
     def __str__(self):
         return "RankResult(entities={self.entities}, scores={self.scores})".format(self=self)
 
@@ -372,6 +666,8 @@ class NumericPredictionResult(PredictionResult):
     Represents a single numerical prediction for a user
     """
 
+    __slots__ = ('value',)
+
     def __init__(self, value, pid, name, meta=None):
         """
         Args:
@@ -392,6 +688,8 @@ class AnticipateResult(PredictionResult):
     Represents a single anticipate prediction for a user
     """
 
+    __slots__ = ('value',)
+
     def __init__(self, value, pid, name, meta=None):
         """
         Args:
@@ -412,6 +710,8 @@ class CustomResult(PredictionResult):
     Represents a custom prediction for a user [for advanced usage]
     """
 
+    __slots__ = ('value',)
+
     def __init__(self, value, pid, name, meta=None):
         """
         Args:
@@ -427,10 +727,26 @@ class CustomResult(PredictionResult):
         return "CustomResult(value={self.value})".format(self=self)
 
 
+# predictor type, the pid prefix -> prediction result class
+_RESULT_TYPES = {
+    'rank': RankResult,
+    'predict': NumericPredictionResult,
+    'anticipate': AnticipateResult,
+    'custom': CustomResult,
+}
+
+
+def _name_query(name):
+    """
+    Returns:
+        str: query string for the optional predictor custom name
+    """
+    return "" if name is None else "?name=" + quote(name, safe="")
+
+
 def _get_meta_from_response_headers(response):
     """
     Returns:
         dict: meta data extracted from the response headers
     """
-    return dict((k.replace("X-", "", 1), v)
-                for (k, v) in response.headers.items() if k.startswith("X-"))
+    return {k[2:]: v for (k, v) in response.headers.items() if k.startswith("X-")}
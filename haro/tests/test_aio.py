@@ -0,0 +1,91 @@
+import asyncio
+import gc
+import json
+import warnings
+from unittest import TestCase, skipIf
+
+from haro import api
+
+try:
+    import httpx
+    from haro import aio
+except ImportError:
+    # httpx is optional
+    httpx = None
+
+
+def _json_body(obj):
+    # encoded independently of the library, so the decoding tests don't round trip through it
+    return json.dumps(obj).encode('utf-8')
+
+
+def _mock_transport(responses):
+    """
+    Args:
+        responses (dict): url path -> json response body
+    """
+    def handler(request):
+        if request.url.path not in responses:
+            return httpx.Response(404)
+        return httpx.Response(200, content=_json_body(responses[request.url.path]),
+                              headers={'X-ADDITIONAL-INFO': 'some-value', 'X-Request-Id': 'r-1',
+                                       'other-headers': 'present'})
+    return httpx.MockTransport(handler)
+
+
+@skipIf(httpx is None, "httpx is not installed")
+class TestAsyncHaroAPIClient(TestCase):
+    def setUp(self):
+        api._PREDICTION_API_ENDPOINT = "http://test-prediction-api/"
+        api._PREDICTION_API_VERSION = "v42.526"
+
+    def _run(self, responses, coroutine_function):
+        async def run():
+            async with aio.AsyncHaroAPIClient(api_id="test-api-id", api_key="test-api-key",
+                                              transport=_mock_transport(responses)) as haro_api:
+                return await coroutine_function(haro_api)
+        return asyncio.run(run())
+
+    def test_rank(self):
+        responses = {'/v42.526/rank/rank-items-for-action-watch/user/u1/':
+                     {'entities': ['item-3', 'item-1', 'item-2'], 'scores': [0.79, 0.43, 0.05]}}
+        r = self._run(responses, lambda haro_api: haro_api.rank(
+            pid="rank-items-for-action-watch", user="u1", include_scores=True))
+        self.assertEqual(r.entities, ['item-3', 'item-1', 'item-2'])
+        self.assertEqual(r.scores, [0.79, 0.43, 0.05])
+        self.assertEqual(r.meta, {"ADDITIONAL-INFO": "some-value", "Request-Id": "r-1"})
+
+    def test_batch_predict(self):
+        responses = {
+            '/v42.526/rank/rank-items-for-action-watch/user/u1/': {'entities': ['item-3', 'item-1']},
+            '/v42.526/predict/predict-avg-context-for-action-watch-context-duration_seconds/user/u1/':
+                {'value': 31.41},
+            '/v42.526/anticipate/anticipate-condition-eebc14df57-within-3-hours/user/u2/': {'value': 0.79},
+            '/v42.526/custom/custom-predictor-for-home-page/user/u2/': {'value': {"custom-values": [3, 1, 4]}},
+        }
+        results = self._run(responses, lambda haro_api: haro_api.batch_predict([
+            {"pid": "rank-items-for-action-watch", "user": "u1", "top": 2},
+            {"pid": "predict-avg-context-for-action-watch-context-duration_seconds", "user": "u1"},
+            {"pid": "anticipate-condition-eebc14df57-within-3-hours", "user": "u2", "name": "v2"},
+            {"pid": "custom-predictor-for-home-page", "user": "u2"},
+        ]))
+        r1, r2, r3, r4 = results
+        self.assertEqual(r1.entities, ['item-3', 'item-1'])
+        self.assertEqual(r2.value, 31.41)
+        self.assertEqual(r3.value, 0.79)
+        self.assertEqual(r3.name, "v2")
+        self.assertEqual(r4.value, {"custom-values": [3, 1, 4]})
+        # an unknown pid fails the whole batch before any prediction is started
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with self.assertRaises(ValueError):
+                self._run(responses, lambda haro_api: haro_api.batch_predict([
+                    {"pid": "predict-avg-context-for-action-watch-context-duration_seconds", "user": "u1"},
+                    {"pid": "unknown-predictor", "user": "u1"},
+                ]))
+            gc.collect()
+        self.assertEqual([w for w in caught if issubclass(w.category, RuntimeWarning)], [])
+
+    def test_http_error(self):
+        with self.assertRaises(IOError):
+            self._run({}, lambda haro_api: haro_api.predict(pid="predict-missing", user="u1"))
@@ -1,12 +1,18 @@
+import gzip
 import json
 import time
-from unittest import TestCase
+from unittest import TestCase, skipIf
 
 import requests_mock
 
 from haro import api
 
 
+def _json_body(obj):
+    # encoded independently of the library, so the decoding tests don't round trip through it
+    return json.dumps(obj).encode('utf-8')
+
+
 class TestEvent(TestCase):
     def test_validate(self):
         now = int(time.time() * 1000)
@@ -23,6 +29,16 @@ class TestEvent(TestCase):
                       context={"k1": "v1"})
         with self.assertRaises(ValueError):
             e.validate()
+        # Trailing newline
+        e = api.Event(id="event-id-1", action="a1\n", item="i1", timestamp=now, user="u1",
+                      context={"k1": "v1"})
+        with self.assertRaises(ValueError):
+            e.validate()
+        # Non-ascii user
+        e = api.Event(id="event-id-1", action="a1", item="i1", timestamp=now, user=u"\u00fcser",
+                      context={"k1": "v1"})
+        with self.assertRaises(ValueError):
+            e.validate()
         # Long item
         e = api.Event(id="event-id-1", action="a1", item="long-str" * 100,
                       timestamp=now, user="u1", context={"k1": "v1"})
@@ -32,11 +48,23 @@ class TestEvent(TestCase):
         with self.assertRaises(ValueError):
             api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=None,
                           user="u1", context={"k1": "v1"})
+        # Numeric string and float timestamps are converted to int
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=str(now),
+                      user="u1", context={"k1": "v1"})
+        self.assertEqual(e.timestamp, now)
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now + 0.5,
+                      user="u1", context={"k1": "v1"})
+        self.assertEqual(e.timestamp, now)
         # Invalid timestamp
         e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=10**100,
                       user="u1", context={"k1": "v1"})
         with self.assertRaises(ValueError):
             e.validate()
+        # Timestamp before unix epoch
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=-1,
+                      user="u1", context={"k1": "v1"})
+        with self.assertRaises(ValueError):
+            e.validate()
 
         # Invalid context
         e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
@@ -49,6 +77,30 @@ class TestEvent(TestCase):
                       user="u1", context={"k1#$%": "v1"})
         with self.assertRaises(ValueError):
             e.validate()
+        # Context key with a space
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
+                      user="u1", context={"k 1": "v1"})
+        with self.assertRaises(ValueError):
+            e.validate()
+        # bool and subclasses of the numeric and string types are valid context values
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
+                      user="u1", context={"k1": True, "k2": type("Label", (str,), {})("v2")})
+        e.validate()
+        # None context value
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
+                      user="u1", context={"k1": None})
+        with self.assertRaises(ValueError):
+            e.validate()
+        # NaN and infinite context values are not valid json
+        for value in (float('nan'), float('inf'), float('-inf')):
+            e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
+                          user="u1", context={"k1": value})
+            with self.assertRaises(ValueError):
+                e.validate()
+            with self.assertRaises(ValueError):
+                api._validate_events([e])
+            with self.assertRaises(ValueError):
+                api._json_encode(e.as_dict())
         # nested context value
         e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
                       user="u1", context={"k2": {"k3": [1, 2]}})
@@ -56,25 +108,55 @@ class TestEvent(TestCase):
             e.validate()
 
 
+    def test_no_instance_dict(self):
+        # events are batched by the thousand, keep them slotted
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=0, user="u1")
+        self.assertFalse(hasattr(e, '__dict__'))
+        with self.assertRaises(AttributeError):
+            e.extra = "value"
+
+    def test_now_ms(self):
+        before = int(time.time() * 1000)
+        now = api.now_ms()
+        self.assertIs(type(now), int)
+        self.assertTrue(before <= now <= int(time.time() * 1000) + 1)
+        api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now, user="u1").validate()
+
+
 class TestHaroAPIClient(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         api._EVENTS_API_ENDPOINT = "http://test-events-api/"
         api._EVENTS_API_VERSION = "v31.415"
         api._PREDICTION_API_ENDPOINT = "http://test-prediction-api/"
         api._PREDICTION_API_VERSION = "v42.526"
+        # a single mocked transport for the whole class, tests register the urls they need
+        cls.m = requests_mock.Mocker()
+        cls.m.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.m.stop()
+
+    def setUp(self):
+        del self.m.request_history[:]
 
-    @requests_mock.mock()
-    def test_send_events(self, m):
-        m.post('http://test-events-api/v31.415/events', text=json.dumps({'status': 'ok', 'count': 2}))
+    def test_send_events(self):
+        m = self.m
+        m.post('http://test-events-api/v31.415/events', content=_json_body({'status': 'ok', 'count': 2}))
         now = int(time.time() * 1000)
         e1 = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
                        user="u1", context={"k1": "v1", "k2": 3.1415})
         e2 = api.Event(id="event-id-2", action="action-2", item="item-2", timestamp=now,
                        user="u1", context={})
-        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
-        num_sent, errors = haro_api.send_events([e1, e2])
+        with api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key") as haro_api:
+            num_sent, errors = haro_api.send_events([e1, e2])
         self.assertEqual(num_sent, 2)
         self.assertEqual(errors, [])
+        self.assertEqual(m.last_request.timeout, (api._CONNECT_TIMEOUT, api._READ_TIMEOUT))
+        self.assertEqual(m.last_request.headers['X-API-ID'], "test-api-id")
+        self.assertEqual(m.last_request.headers['X-API-KEY'], "test-api-key")
+        self.assertEqual(m.last_request.headers['Content-Type'], "application/json")
         self.assertEqual(m.last_request.json(),
                          [{'action': 'action_1', 'user': 'u1',
                            'context': {'k1': 'v1', 'k2': 3.1415},
@@ -82,10 +164,108 @@ class TestHaroAPIClient(TestCase):
                           {'action': 'action-2', 'user': 'u1', 'context': {},
                            'item': 'item-2', 'id': 'event-id-2', 'ts': now}])
 
-    @requests_mock.mock()
-    def test_rank(self, m):
+    def test_send_events_invalid(self):
+        m = self.m
+        m.post('http://test-events-api/v31.415/events', content=_json_body({'status': 'ok', 'count': 2}))
+        now = int(time.time() * 1000)
+        valid = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
+                          user="u1", context={"k1": "v1"})
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
+        invalid_events = [
+            api.Event(id="event-id-2", action="a1?", item="item-2", timestamp=now, user="u1"),
+            api.Event(id="event-id-2", action="action_1", item="item-2", timestamp=10**100, user="u1"),
+            api.Event(id="event-id-2", action="action_1", item="item-2", timestamp=now, user="u1",
+                      context={"k1#$%": "v1"}),
+            api.Event(id="event-id-2", action="action_1", item="item-2", timestamp=now, user="u1",
+                      context={"k2": {"k3": [1, 2]}}),
+            api.Event(id="event-id-2", action="action_1", item="item-2", timestamp=now, user="u1",
+                      context="I am not a dictionary"),
+        ]
+        for invalid in invalid_events:
+            with self.assertRaises(ValueError):
+                haro_api.send_events([valid, invalid])
+        self.assertFalse(m.called)
+
+    def test_send_events_unvalidated(self):
+        m = self.m
+        m.post('http://test-events-api/v31.415/events', content=_json_body({'status': 'ok', 'count': 1}))
+        now = int(time.time() * 1000)
+        events = [
+            api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now, user="u1"),
+            api.Event(id="event-id-2", action="action_1", item="item-2", timestamp=10**100, user="u1"),
+            api.Event(id="event-id-3", action="action_1", item="item-3", timestamp=now, user="u1",
+                      context={1: "v1"}),
+        ]
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
+        # invalid events are sent as is, for the server to ignore
+        self.assertEqual(haro_api.send_events(events, validate=False), (1, []))
+        self.assertEqual(m.last_request.qs['ignore_invalid'], ['true'])
+        self.assertEqual([e['ts'] for e in m.last_request.json()], [now, 10**100, now])
+        self.assertEqual(m.last_request.json()[2]['context'], {'1': 'v1'})
+
+    @skipIf(api.msgspec is None, "msgspec is not installed")
+    def test_send_events_msgpack(self):
+        m = self.m
+        m.post('http://test-events-api/v31.415/events', content=_json_body({'status': 'ok', 'count': 1}))
+        now = int(time.time() * 1000)
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now,
+                      user="u1", context={"k1": "v1", "k2": 3.1415})
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key", wire_format="msgpack")
+        num_sent, errors = haro_api.send_events([e])
+        self.assertEqual(num_sent, 1)
+        self.assertEqual(m.last_request.headers['Content-Type'], "application/msgpack")
+        self.assertEqual(api.msgspec.msgpack.decode(m.last_request.body),
+                         [{'action': 'action_1', 'user': 'u1',
+                           'context': {'k1': 'v1', 'k2': 3.1415},
+                           'item': 'item-1', 'id': 'event-id-1', 'ts': now}])
+        # integers over 64 bits can't be sent in msgpack, even for the server to ignore
+        e2 = api.Event(id="event-id-2", action="action_1", item="item-2", timestamp=10**100, user="u1")
+        del m.request_history[:]
+        with self.assertRaisesRegex(ValueError, "event-id-2"):
+            haro_api.send_events([e, e2], validate=False)
+        self.assertFalse(m.called)
+
+    def test_send_events_compressed(self):
+        m = self.m
+        m.post('http://test-events-api/v31.415/events', content=_json_body({'status': 'ok', 'count': 100}))
+        now = int(time.time() * 1000)
+        events = [api.Event(id="event-id-{}".format(i), action="action_1", item="item-1", timestamp=now,
+                            user="u1", context={"k1": "v1", "k2": 3.1415}) for i in range(100)]
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key", compress=True)
+        haro_api.send_events(events)
+        encoding = m.last_request.headers['Content-Encoding']
+        if encoding == "zstd":
+            body = api.zstandard.decompress(m.last_request.body)
+        else:
+            self.assertEqual(encoding, "gzip")
+            body = gzip.decompress(m.last_request.body)
+        self.assertEqual(json.loads(body.decode('utf-8')), [e.as_dict() for e in events])
+        # small batches are sent as is
+        haro_api.send_events(events[:1])
+        self.assertNotIn('Content-Encoding', m.last_request.headers)
+        self.assertEqual(m.last_request.json(), [events[0].as_dict()])
+
+    def test_unsupported_wire_format(self):
+        with self.assertRaises(ValueError):
+            api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key", wire_format="xml")
+
+    def test_send_events_server_error(self):
+        m = self.m
+        m.post('http://test-events-api/v31.415/events', status_code=503)
+        now = int(time.time() * 1000)
+        e = api.Event(id="event-id-1", action="action_1", item="item-1", timestamp=now, user="u1")
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
+        with self.assertRaises(IOError):
+            haro_api.send_events([e])
+        # retries are left to the connection pool's retry policy
+        adapter = haro_api._session.get_adapter("https://events.haro.io")
+        self.assertEqual(adapter.max_retries.total, api._MAX_RETRIES)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+
+    def test_rank(self):
+        m = self.m
         m.get('http://test-prediction-api/v42.526/rank/rank-items-for-action-watch/user/u1/',
-              text=json.dumps({'entities': ['item-3', 'item-1', 'item-2'], 'scores': [0.79, 0.43, 0.05]}),
+              content=_json_body({'entities': ['item-3', 'item-1', 'item-2'], 'scores': [0.79, 0.43, 0.05]}),
               headers={'X-ADDITIONAL-INFO': 'some-value', 'other-headers': 'present'})
         haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
         r = haro_api.rank(pid="rank-items-for-action-watch", user="u1", subset=['item-1', 'item-2', 'item-3'],
@@ -93,39 +273,87 @@ class TestHaroAPIClient(TestCase):
         self.assertEqual(r.entities, ['item-3', 'item-1', 'item-2'])
         self.assertEqual(r.scores, [0.79, 0.43, 0.05])
         self.assertEqual(r.meta, {"ADDITIONAL-INFO": "some-value"})
+        self.assertEqual(json.loads(m.last_request.qs['subset'][0]), ['item-1', 'item-2', 'item-3'])
+        haro_api.rank(pid="rank-items-for-action-watch", user="u1")
+        self.assertEqual(m.last_request.qs, {'include_scores': ['false']})
 
-    @requests_mock.mock()
-    def test_predict(self, m):
+    def test_predict(self):
+        m = self.m
         m.get('http://test-prediction-api/v42.526/predict/predict-avg-context-for-action-watch-context-duration_seconds/user/u1/',
-              text=json.dumps({'value': 31.41}),
+              content=_json_body({'value': 31.41}),
               headers={'X-ADDITIONAL-INFO': 'some-value', 'other-headers': 'present'})
         haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
         r = haro_api.predict(pid="predict-avg-context-for-action-watch-context-duration_seconds", user="u1")
         self.assertEqual(r.value, 31.41)
+        self.assertEqual(m.last_request.qs, {})
         self.assertEqual(r.meta, {"ADDITIONAL-INFO": "some-value"})
 
-    @requests_mock.mock()
-    def test_anticipate(self, m):
+    def test_predict_quotes_url_path(self):
+        m = self.m
+        m.get('http://test-prediction-api/v42.526/predict/predict-avg-context-for-action-watch/user/u%2F1%3F/',
+              content=_json_body({'value': 31.41}))
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
+        r = haro_api.predict(pid="predict-avg-context-for-action-watch", user="u/1?")
+        self.assertEqual(r.value, 31.41)
+
+    def test_anticipate(self):
+        m = self.m
         m.get('http://test-prediction-api/v42.526/anticipate/anticipate-condition-eebc14df57-within-3-hours/user/u1/',
-              text=json.dumps({'value': 0.79}),
+              content=_json_body({'value': 0.79}),
               headers={'X-ADDITIONAL-INFO': 'some-value', 'other-headers': 'present'})
         haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
         r = haro_api.anticipate(pid="anticipate-condition-eebc14df57-within-3-hours", user="u1", name="v2")
         self.assertEqual(r.value, 0.79)
+        self.assertEqual(m.last_request.qs, {'name': ['v2']})
         self.assertEqual(r.meta, {"ADDITIONAL-INFO": "some-value"})
 
-    @requests_mock.mock()
-    def test_custom(self, m):
+    def test_custom(self):
+        m = self.m
         m.get('http://test-prediction-api/v42.526/custom/custom-predictor-for-home-page/user/u1/',
-              text=json.dumps({'value': {"custom-values": [3, 1, 4]}}),
+              content=_json_body({'value': {"custom-values": [3, 1, 4]}}),
               headers={'X-ADDITIONAL-INFO': 'some-value', 'other-headers': 'present'})
         haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
         r = haro_api.custom(pid="custom-predictor-for-home-page", user="u1", name="v2")
         self.assertEqual(r.value, {"custom-values": [3, 1, 4]})
         self.assertEqual(r.meta, {"ADDITIONAL-INFO": "some-value"})
 
-    @requests_mock.mock()
-    def test_all_predictions(self, m):
+    def test_bulk_rank(self):
+        m = self.m
+        for user in ('u1', 'u2', 'u3'):
+            m.get('http://test-prediction-api/v42.526/rank/rank-items-for-action-watch/user/{}/'.format(user),
+                  content=_json_body({'entities': ['item-{}'.format(user), 'item-1']}))
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
+        results = haro_api.bulk_rank([{"pid": "rank-items-for-action-watch", "user": user, "top": 2}
+                                      for user in ('u1', 'u2', 'u3')])
+        self.assertEqual([r.entities for r in results],
+                         [['item-u1', 'item-1'], ['item-u2', 'item-1'], ['item-u3', 'item-1']])
+        haro_api.close()
+
+    def test_bulk_predict(self):
+        m = self.m
+        pid = "predict-avg-context-for-action-watch-context-duration_seconds"
+        for (user, value) in (('u1', 31.41), ('u2', 2.71)):
+            m.get('http://test-prediction-api/v42.526/predict/{}/user/{}/'.format(pid, user),
+                  content=_json_body({'value': value}))
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
+        results = haro_api.bulk_predict([{"pid": pid, "user": user} for user in ('u1', 'u2')])
+        self.assertEqual([r.value for r in results], [31.41, 2.71])
+        haro_api.close()
+
+    def test_bulk_http_error(self):
+        m = self.m
+        m.get('http://test-prediction-api/v42.526/rank/rank-items-for-action-watch/user/u1/',
+              content=_json_body({'entities': ['item-1']}))
+        m.get('http://test-prediction-api/v42.526/rank/rank-items-for-action-watch/user/u2/',
+              status_code=503)
+        haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
+        # an error in any of the calls fails the whole bulk call
+        with self.assertRaises(IOError):
+            haro_api.bulk_rank([{"pid": "rank-items-for-action-watch", "user": user} for user in ('u1', 'u2')])
+        haro_api.close()
+
+    def test_all_predictions(self):
+        m = self.m
         api_result = [
             {
                 "pid": "rank-items-for-action-watch",
@@ -148,8 +376,15 @@ class TestHaroAPIClient(TestCase):
                     'value': 0.79
                 },
             },
+            {
+                "pid": "unknown-predictor-type",
+                "name": "unknown",
+                "predictions": {
+                    'value': 3
+                },
+            },
         ]
-        m.get('http://test-prediction-api/v42.526/all-predictions/user/u1/', text=json.dumps(api_result))
+        m.get('http://test-prediction-api/v42.526/all-predictions/user/u1/', content=_json_body(api_result))
         haro_api = api.HaroAPIClient(api_id="test-api-id", api_key="test-api-key")
         results = haro_api.all_predictions(user="u1")
         self.assertEquals(len(results), 3)